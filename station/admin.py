@@ -16,11 +16,14 @@ from station.models import (
 class TicketInLine(admin.TabularInline):
     model = Ticket
     extra = 1
+    raw_id_fields = ("carriage", "journey")
 
 
 @admin.register(Order)
 class OrderAdmin(admin.ModelAdmin):
     inlines = (TicketInLine,)
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
 
 
 class CarriageInLine(admin.TabularInline):
@@ -31,12 +34,40 @@ class CarriageInLine(admin.TabularInline):
 @admin.register(Train)
 class TrainAdmin(admin.ModelAdmin):
     inlines = (CarriageInLine,)
+    list_select_related = ("train_type",)
+
+
+@admin.register(Carriage)
+class CarriageAdmin(admin.ModelAdmin):
+    list_select_related = ("train", "train__train_type")
+    raw_id_fields = ("train",)
+
+
+@admin.register(Route)
+class RouteAdmin(admin.ModelAdmin):
+    list_select_related = ("from_station", "to_station")
+
+
+@admin.register(Journey)
+class JourneyAdmin(admin.ModelAdmin):
+    list_select_related = ("route", "train", "train__train_type")
+    raw_id_fields = ("route", "train")
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related("crew")
+
+
+@admin.register(Ticket)
+class TicketAdmin(admin.ModelAdmin):
+    list_select_related = (
+        "carriage__train",
+        "journey__route",
+        "journey__train",
+        "order__user",
+    )
+    raw_id_fields = ("journey", "carriage", "order")
 
 
 admin.site.register(TrainType)
-admin.site.register(Carriage)
 admin.site.register(Station)
-admin.site.register(Route)
 admin.site.register(Crew)
-admin.site.register(Journey)
-admin.site.register(Ticket)
@@ -0,0 +1,57 @@
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+LIST_CACHE_TIMEOUT = 60 * 5
+
+
+def list_cache_version_key(model):
+    """Return the cache key holding the current version of a model's list"""
+    return f"{model._meta.label_lower}-list-version"
+
+
+def invalidate_list_cache(model):
+    """Start a new list version, so every cached copy of the list goes stale"""
+    cache.set(list_cache_version_key(model), time.time_ns(), None)
+
+
+def list_cache_key(model, request):
+    """
+    Return the cache key of a model's list response.
+    Keyed by scheme and host too, as the payload holds absolute media URLs.
+    """
+    version_key = list_cache_version_key(model)
+    version = cache.get(version_key)
+    if version is None:
+        cache.add(version_key, time.time_ns(), None)
+        version = cache.get(version_key)
+    base_url = request.build_absolute_uri("/")
+    return f"{model._meta.label_lower}-list:{version}:{base_url}"
+
+
+class CachedListMixin:
+    """
+    Cache the serialized list response of low-churn reference data
+    and answer conditional requests with 304 Not Modified.
+    The cache is cleared by station.signals when the model changes.
+    """
+
+    def list(self, request, *args, **kwargs):
+        key = list_cache_key(self.get_queryset().model, request)
+        cached = cache.get(key)
+        if cached is None:
+            data = super().list(request, *args, **kwargs).data
+            etag = hashlib.md5(JSONRenderer().render(data)).hexdigest()
+            cached = {"etag": f'"{etag}"', "data": data}
+            cache.set(key, cached, LIST_CACHE_TIMEOUT)
+
+        headers = {"ETag": cached["etag"]}
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match and cached["etag"] in parse_etags(if_none_match):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(cached["data"], headers=headers)
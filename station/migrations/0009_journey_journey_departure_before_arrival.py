@@ -0,0 +1,20 @@
+# Generated by Django 4.2.5 on 2026-10-15 22:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("station", "0008_alter_crew_image_alter_train_image"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="journey",
+            constraint=models.CheckConstraint(
+                check=models.Q(("departure_time__lt", models.F("arrival_time"))),
+                name="journey_departure_before_arrival",
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.5 on 2026-10-15 22:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("station", "0009_journey_journey_departure_before_arrival"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="carriage",
+            index=models.Index(
+                fields=["train", "number"], name="carriage_train_number_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="journey",
+            index=models.Index(
+                fields=["departure_time", "route"], name="journey_departure_route_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                fields=["journey", "carriage"], name="ticket_journey_carriage_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                fields=["journey", "seat"], name="ticket_journey_seat_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.5 on 2026-10-15 22:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("station", "0010_add_lookup_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="train",
+            name="number",
+            field=models.CharField(db_collation="C", max_length=8, unique=True),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.5 on 2026-10-15 22:18
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_seat_counters(apps, schema_editor):
+    Carriage = apps.get_model("station", "Carriage")
+    Journey = apps.get_model("station", "Journey")
+    Ticket = apps.get_model("station", "Ticket")
+
+    total_seats = (
+        Carriage.objects.filter(train=OuterRef("train"))
+        .order_by()
+        .values("train")
+        .annotate(total=Sum("seats"))
+        .values("total")
+    )
+    seats_taken = (
+        Ticket.objects.filter(journey=OuterRef("pk"))
+        .order_by()
+        .values("journey")
+        .annotate(cnt=Count("id"))
+        .values("cnt")
+    )
+    Journey.objects.update(
+        total_seats=Coalesce(Subquery(total_seats), Value(0)),
+        seats_taken=Coalesce(Subquery(seats_taken), Value(0)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("station", "0011_alter_train_number_collation"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="journey",
+            name="seats_taken",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="journey",
+            name="total_seats",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_seat_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.5 on 2026-10-15 22:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("station", "0012_journey_seat_counters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="journey",
+            index=models.Index(fields=["arrival_time"], name="journey_arrival_idx"),
+        ),
+    ]
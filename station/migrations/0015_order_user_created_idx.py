@@ -0,0 +1,19 @@
+# Generated by Django 4.2.5 on 2026-10-15 22:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("station", "0014_train_name_number_trgm"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["user", "-created_at"], name="order_user_created_idx"
+            ),
+        ),
+    ]
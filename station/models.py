@@ -1,7 +1,10 @@
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.db import models
+from django.db.models import F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Concat, Upper
 
 from station.upload_to_path import UploadToPath
 
@@ -18,7 +21,7 @@ class TrainType(models.Model):
 
 class Train(models.Model):
     name = models.CharField(max_length=255)
-    number = models.CharField(max_length=8, unique=True)
+    number = models.CharField(max_length=8, unique=True, db_collation="C")
     train_type = models.ForeignKey(
         TrainType, on_delete=models.CASCADE, related_name="trains"
     )
@@ -26,12 +29,16 @@ class Train(models.Model):
         blank=True, null=True, upload_to=UploadToPath("train-images/")
     )
 
-    @property
-    def capacity(self):
-        return sum(carriage.seats for carriage in self.carriages.all())
-
     class Meta:
         ordering = ["number"]
+        indexes = [
+            # matches the UPPER(...) LIKE that icontains emits on Postgres
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                OpClass(Upper("number"), name="gin_trgm_ops"),
+                name="train_name_number_trgm",
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -61,17 +68,29 @@ class Carriage(models.Model):
 
     @property
     def seat_price(self):
-        return self.CARRIAGE_TYPE_SEAT_PRICES[Carriage.CarriageType(self.carriage_type)]
+        return self.CARRIAGE_TYPE_SEAT_PRICES[self.carriage_type]
 
     @staticmethod
-    def validate_carriage_number(number, train, error_to_raise):
-        if Carriage.objects.filter(number=number, train=train).exists():
-            raise error_to_raise(
-                {
-                    "number": "Carriage with this number "
-                    "already exists for this train."
-                }
-            )
+    def validate_carriage_numbers(carriages_data, error_to_raise):
+        """Validate a batch of carriages with a single query for taken numbers"""
+        requested = [(data["train"].id, data["number"]) for data in carriages_data]
+        existing = set(
+            Carriage.objects.filter(
+                train__in={train for train, _ in requested},
+                number__in={number for _, number in requested},
+            ).values_list("train", "number")
+        )
+
+        seen = set()
+        for train, number in requested:
+            if (train, number) in existing or (train, number) in seen:
+                raise error_to_raise(
+                    {
+                        "number": f"Carriage with number {number} "
+                        f"already exists for train {train}."
+                    }
+                )
+            seen.add((train, number))
 
     def is_seat_number_valid(self, seat_number):
         return 1 <= seat_number <= self.seats
@@ -83,6 +102,9 @@ class Carriage(models.Model):
                 fields=["number", "train"], name="unique_carriage_number"
             )
         ]
+        indexes = [
+            models.Index(fields=["train", "number"], name="carriage_train_number_idx"),
+        ]
 
     def __str__(self):
         return f"Carriage {self.number} of {self.train}"
@@ -117,6 +139,24 @@ class Route(models.Model):
         return self.name
 
 
+class CrewManager(models.Manager):
+    """Build the crew member full name in the database."""
+
+    def get_queryset(self):
+        return (
+            super()
+            .get_queryset()
+            .annotate(
+                full_name=Concat(
+                    "first_name",
+                    Value(" "),
+                    "last_name",
+                    output_field=models.CharField(),
+                )
+            )
+        )
+
+
 class Crew(models.Model):
     first_name = models.CharField(max_length=255)
     last_name = models.CharField(max_length=255)
@@ -124,6 +164,8 @@ class Crew(models.Model):
         blank=True, null=True, upload_to=UploadToPath("crew-images/")
     )
 
+    objects = CrewManager()
+
     class Meta:
         ordering = ["first_name", "last_name"]
         verbose_name_plural = "crew"
@@ -131,9 +173,12 @@ class Crew(models.Model):
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
-    @property
-    def full_name(self):
-        return f"{self.first_name} {self.last_name}"
+
+class JourneyManager(models.Manager):
+    """Join the route and train that most journey code paths read."""
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("route", "train__train_type")
 
 
 class Journey(models.Model):
@@ -145,19 +190,76 @@ class Journey(models.Model):
     image = models.ImageField(
         blank=True, null=True, upload_to=UploadToPath("journey-images/")
     )
+    total_seats = models.PositiveIntegerField(default=0, editable=False)
+    seats_taken = models.PositiveIntegerField(default=0, editable=False)
 
-    def clean(self):
-        if self.departure_time >= self.arrival_time:
-            raise ValidationError(
+    objects = JourneyManager()
+    # plain manager for code paths that must avoid the joins
+    raw_objects = models.Manager()
+
+    @staticmethod
+    def total_seats_subquery(train):
+        """Sum of seats in all carriages of the given train"""
+        return Coalesce(
+            Subquery(
+                Carriage.objects.filter(train=train)
+                .order_by()
+                .values("train")
+                .annotate(total=Sum("seats"))
+                .values("total")
+            ),
+            Value(0),
+        )
+
+    @staticmethod
+    def refresh_total_seats(train_ids):
+        Journey.raw_objects.filter(train_id__in=train_ids).update(
+            total_seats=Journey.total_seats_subquery(OuterRef("train"))
+        )
+
+    @staticmethod
+    def add_seats_taken(journey_id, count):
+        Journey.raw_objects.filter(pk=journey_id).update(
+            seats_taken=F("seats_taken") + count
+        )
+
+    @staticmethod
+    def validate_journey_time(departure_time, arrival_time, error_to_raise):
+        if departure_time >= arrival_time:
+            raise error_to_raise(
                 {"arrival_time": "Arrival time must be greater than departure time"}
             )
 
+    def clean(self):
+        self.validate_journey_time(
+            self.departure_time, self.arrival_time, ValidationError
+        )
+
     def save(self, *args, **kwargs):
-        self.full_clean()
-        return super(Journey, self).save(*args, **kwargs)
+        # seats_taken only moves through F() updates, a stale copy must not
+        # overwrite tickets booked since this row was read
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "seats_taken"
+            ]
+        super().save(*args, **kwargs)
 
     class Meta:
         ordering = ["-departure_time"]
+        constraints = [
+            models.CheckConstraint(
+                check=models.Q(departure_time__lt=models.F("arrival_time")),
+                name="journey_departure_before_arrival",
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["departure_time", "route"], name="journey_departure_route_idx"
+            ),
+            models.Index(fields=["arrival_time"], name="journey_arrival_idx"),
+        ]
 
     def __str__(self):
         return (
@@ -174,11 +276,25 @@ class Order(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "-created_at"], name="order_user_created_idx"),
+        ]
 
     def __str__(self):
         return f"Order {self.id} by {self.user} at {self.created_at}"
 
 
+class TicketManager(models.Manager):
+    """Join the carriage and journey that ticket price and __str__ read."""
+
+    def get_queryset(self):
+        return (
+            super()
+            .get_queryset()
+            .select_related("carriage", "journey__route", "journey__train")
+        )
+
+
 class Ticket(models.Model):
     seat = models.IntegerField()
     carriage = models.ForeignKey(
@@ -189,25 +305,16 @@ class Ticket(models.Model):
     )
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="tickets")
 
+    objects = TicketManager()
+    # plain manager for code paths that must avoid the joins
+    raw_objects = models.Manager()
+
     @property
     def price(self):
         return self.carriage.seat_price
 
     @staticmethod
-    def validate_ticket(seat, carriage, journey, error_to_raise):
-        if Ticket.objects.filter(
-            carriage=carriage, seat=seat, journey=journey
-        ).exists():
-            raise error_to_raise(
-                {
-                    "seat": f"A ticket for seat: {seat}, "
-                    f"in carriage: {carriage.number}, "
-                    f"on train: {journey.train}, "
-                    f"on journey route: {journey.route.name}, "
-                    f"already exists."
-                }
-            )
-
+    def validate_ticket(seat, carriage, error_to_raise):
         if not carriage.is_seat_number_valid(seat):
             raise error_to_raise(
                 {
@@ -217,28 +324,45 @@ class Ticket(models.Model):
                 }
             )
 
+    @staticmethod
+    def validate_tickets(tickets_data, error_to_raise):
+        """
+        Check a batch of tickets for repeated seats without querying the database.
+        Seats already taken by other orders are rejected
+        by the unique_ticket constraint on insert.
+        """
+        requested = set()
+        for ticket_data in tickets_data:
+            seat, carriage = ticket_data["seat"], ticket_data["carriage"]
+            key = (carriage.id, seat, ticket_data["journey"].id)
+            if key in requested:
+                raise error_to_raise(
+                    {
+                        "seat": f"Seat: {seat}, in carriage: {carriage.number} "
+                        f"is requested more than once."
+                    }
+                )
+            requested.add(key)
+
     def clean(self):
         self.validate_ticket(
             self.seat,
             self.carriage,
-            self.journey,
             ValidationError,
         )
 
-    def save(
-        self, force_insert=False, force_update=False, using=None, update_fields=None
-    ):
-        self.full_clean()
-        return super(Ticket, self).save(
-            force_insert, force_update, using, update_fields
-        )
-
     class Meta:
         constraints = [
             models.UniqueConstraint(
                 fields=["carriage", "seat", "journey"], name="unique_ticket"
             )
         ]
+        indexes = [
+            models.Index(
+                fields=["journey", "carriage"], name="ticket_journey_carriage_idx"
+            ),
+            models.Index(fields=["journey", "seat"], name="ticket_journey_seat_idx"),
+        ]
         ordering = ["carriage", "seat"]
 
     def __str__(self):
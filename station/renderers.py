@@ -0,0 +1,50 @@
+import math
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+def _has_non_finite_float(data):
+    if isinstance(data, float):
+        return not math.isfinite(data)
+    if isinstance(data, dict):
+        return any(_has_non_finite_float(value) for value in data.values())
+    if isinstance(data, (list, tuple)):
+        return any(_has_non_finite_float(value) for value in data)
+    return False
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Render JSON with orjson.
+    Datetimes and types orjson can't encode (Decimal, lazy strings)
+    are passed to DRF's encoder. Data orjson would encode differently
+    (NaN/Infinity, integers beyond 64 bits) is rendered by JSONRenderer.
+    Floats may still differ in notation, e.g. 1e16 instead of 1e+16.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        options = self.options
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default, option=options
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # orjson writes NaN and Infinity as null, let DRF reject them
+        if b"null" in ret and _has_non_finite_float(data):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # U+2028/U+2029 are valid JSON but break JavaScript string literals
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
@@ -1,7 +1,16 @@
-from django.db import transaction
+import operator
+from collections import Counter, defaultdict
+from functools import reduce
+
+from django.db import transaction, IntegrityError
+from django.db.models import Q
+from django.utils import timezone
+from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from station.cache import invalidate_list_cache
+
 from station.models import (
     TrainType,
     Train,
@@ -14,6 +23,19 @@ from station.models import (
     Ticket,
 )
 
+DATETIME_FORMAT = "%Y-%m-%d %H:%M"
+
+
+class ImageSerializer(serializers.ModelSerializer):
+    """Base for the upload-image serializers, saves the image column only"""
+
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        if validated_data:
+            instance.save(update_fields=list(validated_data))
+        return instance
+
 
 class TrainTypeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -21,19 +43,44 @@ class TrainTypeSerializer(serializers.ModelSerializer):
         fields = ("id", "name")
 
 
-class CarriageSerializer(serializers.ModelSerializer):
+class CarriageBulkSerializer(serializers.ListSerializer):
     def validate(self, attrs):
-        data = super().validate(attrs=attrs)
-        Carriage.validate_carriage_number(
-            attrs["number"],
-            attrs["train"],
-            ValidationError,
-        )
-        return data
+        Carriage.validate_carriage_numbers(attrs, ValidationError)
+        return attrs
+
+    def create(self, validated_data):
+        # numbers taken after validation are rejected by unique_carriage_number
+        try:
+            with transaction.atomic():
+                carriages = Carriage.objects.bulk_create(
+                    [Carriage(**data) for data in validated_data], batch_size=500
+                )
+                # bulk_create does not send post_save, so refresh the seats here
+                Journey.refresh_total_seats(
+                    {carriage.train_id for carriage in carriages}
+                )
+                return carriages
+        except IntegrityError:
+            raise ValidationError(
+                {"number": "Carriage with this number already exists for this train."}
+            )
+
+
+class CarriageSerializer(serializers.ModelSerializer):
+    def create(self, validated_data):
+        # taken numbers are rejected by the unique_carriage_number constraint
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise ValidationError(
+                {"number": "Carriage with this number already exists for this train."}
+            )
 
     class Meta:
         model = Carriage
         fields = ("id", "number", "carriage_type", "seats", "seat_price", "train")
+        list_serializer_class = CarriageBulkSerializer
 
 
 class CarriageListSerializer(CarriageSerializer):
@@ -49,6 +96,7 @@ class TrainSerializer(serializers.ModelSerializer):
 class TrainListSerializer(TrainSerializer):
     train_type = serializers.SlugRelatedField(read_only=True, slug_field="name")
     carriage_count = serializers.IntegerField(read_only=True)
+    capacity = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Train
@@ -62,6 +110,37 @@ class TrainListSerializer(TrainSerializer):
             "image",
         )
 
+    values_fields = (
+        "id",
+        "name",
+        "number",
+        "train_type__name",
+        "carriage_count",
+        "capacity",
+        "image",
+    )
+
+    @staticmethod
+    def represent_values(trains, request):
+        """Build list representation straight from `values_fields` rows"""
+        storage = Train._meta.get_field("image").storage
+        return [
+            {
+                "id": train["id"],
+                "name": train["name"],
+                "number": train["number"],
+                "train_type": train["train_type__name"],
+                "carriage_count": train["carriage_count"],
+                "capacity": train["capacity"],
+                "image": (
+                    request.build_absolute_uri(storage.url(train["image"]))
+                    if train["image"]
+                    else None
+                ),
+            }
+            for train in trains
+        ]
+
 
 class TrainDetailSerializer(TrainSerializer):
     train_type = TrainTypeSerializer(many=False, read_only=True)
@@ -72,7 +151,7 @@ class TrainDetailSerializer(TrainSerializer):
         fields = ("id", "name", "number", "train_type", "carriages", "image")
 
 
-class TrainImageSerializer(serializers.ModelSerializer):
+class TrainImageSerializer(ImageSerializer):
     class Meta:
         model = Train
         fields = ("id", "image")
@@ -106,12 +185,20 @@ class RouteListSerializer(RouteSerializer):
 
 
 class CrewSerializer(serializers.ModelSerializer):
+    full_name = serializers.CharField(read_only=True)
+
     class Meta:
         model = Crew
         fields = ("id", "first_name", "last_name", "full_name", "image")
 
+    def create(self, validated_data):
+        crew = super().create(validated_data)
+        # reads get the full name from the manager annotation
+        crew.full_name = f"{crew.first_name} {crew.last_name}"
+        return crew
 
-class CrewImageSerializer(serializers.ModelSerializer):
+
+class CrewImageSerializer(ImageSerializer):
     class Meta:
         model = Crew
         fields = ("id", "image")
@@ -120,9 +207,7 @@ class CrewImageSerializer(serializers.ModelSerializer):
 class TicketSerializer(serializers.ModelSerializer):
     def validate(self, attrs):
         data = super().validate(attrs=attrs)
-        Ticket.validate_ticket(
-            attrs["seat"], attrs["carriage"], attrs["journey"], ValidationError
-        )
+        Ticket.validate_ticket(attrs["seat"], attrs["carriage"], ValidationError)
         return data
 
     class Meta:
@@ -131,16 +216,10 @@ class TicketSerializer(serializers.ModelSerializer):
 
 
 class TicketListSerializer(TicketSerializer):
-    carriage_number = serializers.IntegerField(source="carriage.number", read_only=True)
-    journey_route_name = serializers.CharField(
-        source="journey.route.name", read_only=True
-    )
-    journey_train_number = serializers.IntegerField(
-        source="journey.train.number", read_only=True
-    )
-    journey_departure_time = serializers.CharField(
-        source="journey.departure_time", read_only=True
-    )
+    carriage_number = serializers.IntegerField(read_only=True)
+    journey_route_name = serializers.CharField(read_only=True)
+    journey_train_number = serializers.IntegerField(read_only=True)
+    journey_departure_time = serializers.CharField(read_only=True)
 
     class Meta:
         model = Ticket
@@ -161,20 +240,69 @@ class TicketSeatsSerializer(TicketSerializer):
 
 
 class JourneySerializer(serializers.ModelSerializer):
-    departure_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M")
-    arrival_time = serializers.DateTimeField(format="%Y-%m-%d %H:%M")
+    departure_time = serializers.DateTimeField(format=DATETIME_FORMAT)
+    arrival_time = serializers.DateTimeField(format=DATETIME_FORMAT)
     crew = CrewSerializer(many=True, required=False)
 
     class Meta:
         model = Journey
         fields = ("id", "route", "train", "departure_time", "arrival_time", "crew")
 
+    def validate(self, attrs):
+        data = super().validate(attrs=attrs)
+        Journey.validate_journey_time(
+            attrs.get("departure_time", getattr(self.instance, "departure_time", None)),
+            attrs.get("arrival_time", getattr(self.instance, "arrival_time", None)),
+            ValidationError,
+        )
+        return data
+
+    @staticmethod
+    def get_or_create_crew(crew_data):
+        """Return crew members by full name, creating only the missing ones"""
+        requested = {
+            (data["first_name"], data["last_name"]): data for data in crew_data
+        }
+        if not requested:
+            return []
+
+        crew_members = {
+            (crew.first_name, crew.last_name): crew
+            for crew in Crew.objects.filter(
+                reduce(
+                    operator.or_,
+                    (
+                        Q(first_name=first_name, last_name=last_name)
+                        for first_name, last_name in requested
+                    ),
+                )
+            )
+        }
+        created = Crew.objects.bulk_create(
+            [
+                Crew(**data)
+                for full_name, data in requested.items()
+                if full_name not in crew_members
+            ],
+            batch_size=500,
+        )
+        if created:
+            # bulk_create does not send post_save, so clear the crew list here
+            transaction.on_commit(lambda: invalidate_list_cache(Crew))
+        return [*crew_members.values(), *created]
+
     def create(self, validated_data):
-        crew_data = validated_data.pop("crew", [])
-        journey = Journey.objects.create(**validated_data)
-        crew_members = Crew.objects.bulk_create([Crew(**data) for data in crew_data])
-        journey.crew.add(*crew_members)
-        return journey
+        with transaction.atomic():
+            crew_data = validated_data.pop("crew", [])
+            journey = Journey.objects.create(**validated_data)
+            Journey.crew.through.objects.bulk_create(
+                [
+                    Journey.crew.through(journey=journey, crew=crew)
+                    for crew in self.get_or_create_crew(crew_data)
+                ],
+                ignore_conflicts=True,
+            )
+            return journey
 
 
 class JourneyListSerializer(JourneySerializer):
@@ -183,9 +311,7 @@ class JourneyListSerializer(JourneySerializer):
     train_number = serializers.CharField(source="train.number", read_only=True)
     train_type = serializers.CharField(source="train.train_type.name", read_only=True)
     tickets_available = serializers.IntegerField(read_only=True)
-    crew = serializers.SlugRelatedField(
-        many=True, read_only=True, slug_field="full_name"
-    )
+    crew = serializers.SerializerMethodField()
 
     class Meta:
         model = Journey
@@ -202,6 +328,57 @@ class JourneyListSerializer(JourneySerializer):
             "image",
         )
 
+    @extend_schema_field(serializers.ListField(child=serializers.CharField()))
+    def get_crew(self, obj):
+        return [crew.full_name for crew in obj.crew.all()]
+
+    values_fields = (
+        "id",
+        "route__name",
+        "train__name",
+        "train__number",
+        "train__train_type__name",
+        "tickets_available",
+        "departure_time",
+        "arrival_time",
+        "image",
+    )
+
+    @staticmethod
+    def represent_values(journeys, request):
+        """Build list representation straight from `values_fields` rows"""
+        journeys = list(journeys)
+        crew_names = defaultdict(list)
+        for journey_id, full_name in Crew.objects.filter(
+            journey__in=[journey["id"] for journey in journeys]
+        ).values_list("journey", "full_name"):
+            crew_names[journey_id].append(full_name)
+
+        storage = Journey._meta.get_field("image").storage
+        return [
+            {
+                "id": journey["id"],
+                "route_name": journey["route__name"],
+                "train_name": journey["train__name"],
+                "train_number": journey["train__number"],
+                "train_type": journey["train__train_type__name"],
+                "tickets_available": journey["tickets_available"],
+                "departure_time": timezone.localtime(
+                    journey["departure_time"]
+                ).strftime(DATETIME_FORMAT),
+                "arrival_time": timezone.localtime(journey["arrival_time"]).strftime(
+                    DATETIME_FORMAT
+                ),
+                "crew": crew_names[journey["id"]],
+                "image": (
+                    request.build_absolute_uri(storage.url(journey["image"]))
+                    if journey["image"]
+                    else None
+                ),
+            }
+            for journey in journeys
+        ]
+
 
 class JourneyDetailSerializer(JourneySerializer):
     route = RouteListSerializer(many=False, read_only=True)
@@ -222,7 +399,7 @@ class JourneyDetailSerializer(JourneySerializer):
         )
 
 
-class JourneyImageSerializer(serializers.ModelSerializer):
+class JourneyImageSerializer(ImageSerializer):
     class Meta:
         model = Journey
         fields = ("id", "image")
@@ -230,19 +407,39 @@ class JourneyImageSerializer(serializers.ModelSerializer):
 
 class OrderSerializer(serializers.ModelSerializer):
     tickets = TicketSerializer(many=True, read_only=False, allow_empty=False)
-    created_at = serializers.DateTimeField(format="%Y-%m-%d %H:%M")
+    created_at = serializers.DateTimeField(format=DATETIME_FORMAT)
 
     class Meta:
         model = Order
         fields = ("id", "tickets", "created_at")
 
+    def validate_tickets(self, value):
+        Ticket.validate_tickets(value, ValidationError)
+        return value
+
     def create(self, validated_data):
-        with transaction.atomic():
-            tickets_data = validated_data.pop("tickets")
-            order = Order.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(order=order, **ticket_data)
-            return order
+        tickets_data = validated_data.pop("tickets")
+        try:
+            with transaction.atomic():
+                order = Order.objects.create(**validated_data)
+                Ticket.objects.bulk_create(
+                    [
+                        Ticket(order=order, **ticket_data)
+                        for ticket_data in tickets_data
+                    ],
+                    batch_size=1000,
+                )
+                # bulk_create does not send post_save, so count the seats here
+                journey_seats = Counter(
+                    ticket_data["journey"].id for ticket_data in tickets_data
+                )
+                for journey_id, count in journey_seats.items():
+                    Journey.add_seats_taken(journey_id, count)
+        except IntegrityError:
+            raise ValidationError(
+                {"tickets": "One or more of the requested seats are already taken."}
+            )
+        return order
 
 
 class OrderListSerializer(OrderSerializer):
@@ -0,0 +1,75 @@
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from station.cache import invalidate_list_cache
+from station.models import TrainType, Station, Crew, Carriage, Journey, Ticket
+
+
+@receiver([post_save, post_delete], sender=TrainType)
+@receiver([post_save, post_delete], sender=Station)
+@receiver([post_save, post_delete], sender=Crew)
+def clear_list_cache(sender, **kwargs):
+    """Drop the cached list response of the changed model once committed"""
+    transaction.on_commit(lambda: invalidate_list_cache(sender))
+
+
+@receiver(pre_save, sender=Journey)
+def set_journey_total_seats(sender, instance, update_fields=None, **kwargs):
+    """Store the seat count of the journey's train"""
+    if update_fields is not None and "train" not in update_fields:
+        return
+
+    instance.total_seats = (
+        Carriage.objects.filter(train_id=instance.train_id).aggregate(
+            total=Sum("seats")
+        )["total"]
+        or 0
+    )
+
+
+@receiver(pre_save, sender=Carriage)
+def remember_carriage_train(sender, instance, **kwargs):
+    """Keep the stored train, so its journeys are refreshed if the carriage moves"""
+    instance._previous_train_id = (
+        None
+        if instance._state.adding
+        else Carriage.objects.filter(pk=instance.pk)
+        .values_list("train_id", flat=True)
+        .first()
+    )
+
+
+@receiver([post_save, post_delete], sender=Carriage)
+def update_journeys_total_seats(sender, instance, **kwargs):
+    """Refresh the seat count of journeys made by the carriage's trains"""
+    train_ids = {instance.train_id, getattr(instance, "_previous_train_id", None)}
+    Journey.refresh_total_seats(train_ids - {None})
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_ticket_journey(sender, instance, **kwargs):
+    """Keep the stored journey, so a moved ticket frees its old seat"""
+    instance._previous_journey_id = (
+        None
+        if instance._state.adding
+        else Ticket.raw_objects.filter(pk=instance.pk)
+        .values_list("journey_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Ticket)
+def count_saved_ticket(sender, instance, created, **kwargs):
+    previous_journey_id = getattr(instance, "_previous_journey_id", None)
+    if created:
+        Journey.add_seats_taken(instance.journey_id, 1)
+    elif previous_journey_id not in (None, instance.journey_id):
+        Journey.add_seats_taken(previous_journey_id, -1)
+        Journey.add_seats_taken(instance.journey_id, 1)
+
+
+@receiver(post_delete, sender=Ticket)
+def count_deleted_ticket(sender, instance, **kwargs):
+    Journey.add_seats_taken(instance.journey_id, -1)
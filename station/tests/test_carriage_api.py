@@ -0,0 +1,110 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import Train, TrainType, Carriage
+
+CARRIAGE_URL = reverse("station:carriage-list")
+
+
+class AdminCarriageApiTest(TestCase):
+    def setUp(self):
+        """Set up test client, admin user and a train"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="admin@test.com", password="testpass", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.train = Train.objects.create(
+            name="Sample train",
+            number="123",
+            train_type=TrainType.objects.create(name="express"),
+        )
+        Carriage.objects.create(number=1, seats=20, train=self.train)
+
+    def test_create_carriage_with_taken_number(self):
+        """Test a number already used on the train is rejected"""
+        payload = {"number": 1, "seats": 30, "train": self.train.id}
+
+        res = self.client.post(CARRIAGE_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("number", res.data)
+        self.assertEqual(self.train.carriages.count(), 1)
+
+    def test_create_carriages_in_bulk(self):
+        """Test creating several carriages in one request"""
+        payload = [
+            {"number": number, "seats": 30, "train": self.train.id}
+            for number in (2, 3, 4)
+        ]
+
+        res = self.client.post(CARRIAGE_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(res.data), 3)
+        self.assertEqual(self.train.carriages.count(), 4)
+
+    def test_create_carriages_in_bulk_with_taken_number(self):
+        """Test bulk creation rejects numbers already used on the train"""
+        payload = [
+            {"number": number, "seats": 30, "train": self.train.id} for number in (1, 2)
+        ]
+
+        res = self.client.post(CARRIAGE_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.train.carriages.count(), 1)
+
+    def test_create_carriages_in_bulk_with_number_taken_after_validation(self):
+        """Test a number taken between validation and insert returns 400"""
+        payload = [
+            {"number": number, "seats": 30, "train": self.train.id} for number in (1, 2)
+        ]
+
+        with mock.patch.object(Carriage, "validate_carriage_numbers"):
+            res = self.client.post(CARRIAGE_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("number", res.data)
+        self.assertEqual(self.train.carriages.count(), 1)
+
+    def test_create_carriages_in_bulk_with_repeated_number(self):
+        """Test bulk creation rejects a number repeated in the payload"""
+        payload = [
+            {"number": 2, "seats": 30, "train": self.train.id},
+            {"number": 2, "seats": 40, "train": self.train.id},
+        ]
+
+        res = self.client.post(CARRIAGE_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.train.carriages.count(), 1)
+
+    def test_list_carriages(self):
+        """Test carriage list shows the train name with a count and a page query"""
+        with self.assertNumQueries(2):
+            res = self.client.get(CARRIAGE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"][0]["train"], self.train.name)
+        self.assertEqual(res.data["results"][0]["seat_price"], 50)
+
+    def test_list_carriages_page_size(self):
+        """Test page_size pages through carriages sharing a number by id"""
+        other_train = Train.objects.create(
+            name="Other train", number="456", train_type=self.train.train_type
+        )
+        other = Carriage.objects.create(number=1, seats=20, train=other_train)
+
+        first = self.client.get(CARRIAGE_URL, {"page_size": 1})
+        second = self.client.get(CARRIAGE_URL, {"page_size": 1, "page": 2})
+
+        self.assertEqual(first.data["count"], 2)
+        self.assertEqual(len(first.data["results"]), 1)
+        self.assertEqual(first.data["results"][0]["train"], self.train.name)
+        self.assertEqual(second.data["results"][0]["id"], other.id)
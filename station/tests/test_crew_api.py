@@ -0,0 +1,51 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import Crew
+
+CREW_URL = reverse("station:crew-list")
+
+
+class AdminCrewApiTest(TestCase):
+    def setUp(self):
+        """Set up test client, admin user and clear cached list responses"""
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="admin@test.com", password="testpass", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+
+    def test_create_crew_returns_full_name(self):
+        """Test created crew member is returned with the full name"""
+        payload = {"first_name": "Ivan", "last_name": "Ivanov"}
+
+        res = self.client.post(CREW_URL, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["full_name"], "Ivan Ivanov")
+
+    def test_list_crew_full_name(self):
+        """Test crew list shows full names built by the database"""
+        Crew.objects.create(first_name="Petro", last_name="Petrenko")
+
+        res = self.client.get(CREW_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]["full_name"], "Petro Petrenko")
+
+    @override_settings(ALLOWED_HOSTS=["one.test", "two.test"])
+    def test_list_crew_cached_per_host(self):
+        """Test a cached crew list never serves image URLs of another host"""
+        Crew.objects.create(
+            first_name="Petro", last_name="Petrenko", image="crew-images/petro.jpg"
+        )
+
+        self.client.get(CREW_URL, SERVER_NAME="one.test")
+        res = self.client.get(CREW_URL, SERVER_NAME="two.test")
+
+        self.assertTrue(res.data[0]["image"].startswith("http://two.test/"))
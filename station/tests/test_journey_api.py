@@ -0,0 +1,326 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.serializers import JourneySerializer
+
+from station.models import (
+    TrainType,
+    Train,
+    Carriage,
+    Station,
+    Route,
+    Crew,
+    Journey,
+    Order,
+    Ticket,
+)
+
+JOURNEY_URL = reverse("station:journey-list")
+CREW_URL = reverse("station:crew-list")
+
+
+def journey_detail_url(journey_id):
+    """Return journey detail URL"""
+    return reverse("station:journey-detail", args=[journey_id])
+
+
+def sample_train(**params):
+    """Create and return a sample train"""
+    defaults = {
+        "name": "Sample train",
+        "number": "123",
+        "train_type": TrainType.objects.create(name="express"),
+    }
+    defaults.update(params)
+
+    return Train.objects.create(**defaults)
+
+
+def sample_route(**params):
+    """Create and return a sample route between two stations"""
+    defaults = {
+        "name": "Kyiv - Lviv",
+        "distance": 540,
+        "from_station": Station.objects.create(name="Kyiv", latitude=0, longitude=0),
+        "to_station": Station.objects.create(name="Lviv", latitude=1, longitude=1),
+    }
+    defaults.update(params)
+
+    return Route.objects.create(**defaults)
+
+
+def sample_journey(**params):
+    """Create and return a sample journey"""
+    departure_time = params.pop(
+        "departure_time", timezone.make_aware(datetime(2023, 10, 1, 8, 0))
+    )
+    defaults = {
+        "departure_time": departure_time,
+        "arrival_time": departure_time + timedelta(hours=6),
+    }
+    defaults.update(params)
+    if "route" not in defaults:
+        defaults["route"] = sample_route()
+    if "train" not in defaults:
+        defaults["train"] = sample_train()
+
+    return Journey.objects.create(**defaults)
+
+
+class AuthenticatedJourneyApiTest(TestCase):
+    def setUp(self):
+        """Set up test client and create objects needed for tests"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass"
+        )
+        self.client.force_authenticate(self.user)
+
+        self.journey = sample_journey()
+        self.journey.crew.add(
+            Crew.objects.create(first_name="Ivan", last_name="Ivanov")
+        )
+        self.carriages = [
+            Carriage.objects.create(number=number, seats=10, train=self.journey.train)
+            for number in (1, 2)
+        ]
+        self.order = Order.objects.create(user=self.user)
+
+    def add_tickets(self, *seats):
+        for carriage in self.carriages:
+            for seat in seats:
+                Ticket.objects.create(
+                    seat=seat, carriage=carriage, journey=self.journey, order=self.order
+                )
+
+    def test_retrieve_journey_taken_seats(self):
+        """Test journey detail lists taken seats with their carriages"""
+        self.add_tickets(1, 2)
+
+        res = self.client.get(journey_detail_url(self.journey.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["taken_seats"]), 4)
+        self.assertEqual(len(res.data["train"]["carriages"]), 2)
+        self.assertEqual(res.data["crew"][0]["full_name"], "Ivan Ivanov")
+
+    def test_retrieve_journey_query_count_does_not_grow(self):
+        """Test journey detail query count does not depend on ticket count"""
+        url = journey_detail_url(self.journey.id)
+        self.add_tickets(1)
+        with self.assertNumQueries(4):
+            self.client.get(url)
+
+        self.add_tickets(2, 3, 4)
+        with self.assertNumQueries(4):
+            self.client.get(url)
+
+    def test_list_journeys(self):
+        """Test journey list shows route, train, crew and available tickets"""
+        self.add_tickets(1, 2)
+
+        with self.assertNumQueries(3):
+            res = self.client.get(JOURNEY_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        journey = res.data["results"][0]
+        self.assertEqual(journey["route_name"], "Kyiv - Lviv")
+        self.assertEqual(journey["train_number"], "123")
+        self.assertEqual(journey["train_type"], "express")
+        self.assertEqual(journey["tickets_available"], 16)
+        self.assertEqual(journey["crew"], ["Ivan Ivanov"])
+        self.assertEqual(journey["departure_time"], "2023-10-01 08:00")
+        self.assertIsNone(journey["image"])
+
+    def test_filter_journeys_by_departure_date(self):
+        """Test departure date filter matches the whole date, not the day only"""
+        sample_journey(
+            route=self.journey.route,
+            train=self.journey.train,
+            departure_time=timezone.make_aware(datetime(2023, 11, 1, 8, 0)),
+        )
+
+        res = self.client.get(JOURNEY_URL, {"departure_time": "2023-10-01"})
+
+        self.assertEqual(
+            [journey["id"] for journey in res.data["results"]], [self.journey.id]
+        )
+
+    def test_filter_journeys_with_invalid_params(self):
+        """Test malformed filter values are rejected with a bad request"""
+        for params in ({"train": "abc"}, {"departure_time": "01.10.2023"}):
+            res = self.client.get(JOURNEY_URL, params)
+
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class JourneySeatCounterTest(TestCase):
+    def setUp(self):
+        """Create two journeys of one train with a ticket on the first"""
+        self.journey = sample_journey()
+        self.other_journey = sample_journey(
+            route=self.journey.route, train=self.journey.train
+        )
+        self.carriage = Carriage.objects.create(
+            number=1, seats=10, train=self.journey.train
+        )
+        self.ticket = Ticket.objects.create(
+            seat=1,
+            carriage=self.carriage,
+            journey=self.journey,
+            order=Order.objects.create(
+                user=get_user_model().objects.create_user(
+                    email="test@test.com", password="testpass"
+                )
+            ),
+        )
+
+    def test_moving_ticket_moves_taken_seat(self):
+        """Test a ticket moved to another journey updates both counters"""
+        self.ticket.journey = self.other_journey
+        self.ticket.save()
+
+        self.journey.refresh_from_db()
+        self.other_journey.refresh_from_db()
+        self.assertEqual(self.journey.seats_taken, 0)
+        self.assertEqual(self.other_journey.seats_taken, 1)
+
+    def test_moving_carriage_refreshes_old_train_seats(self):
+        """Test a carriage moved to another train updates both trains' journeys"""
+        new_journey = sample_journey(
+            route=self.journey.route, train=sample_train(number="456")
+        )
+
+        self.carriage.train = new_journey.train
+        self.carriage.save()
+
+        self.journey.refresh_from_db()
+        new_journey.refresh_from_db()
+        self.assertEqual(self.journey.total_seats, 0)
+        self.assertEqual(new_journey.total_seats, 10)
+
+
+class AdminJourneyApiTest(TestCase):
+    def setUp(self):
+        """Set up test client and create admin user"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="admin@test.com", password="testpass", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        self.journey = sample_journey()
+
+    def test_create_journey_reuses_existing_crew(self):
+        """Test creating a journey does not duplicate existing crew members"""
+        Crew.objects.create(first_name="Ivan", last_name="Ivanov")
+        payload = {
+            "route": self.journey.route.id,
+            "train": self.journey.train.id,
+            "departure_time": "2023-10-02 08:00",
+            "arrival_time": "2023-10-02 14:00",
+            "crew": [
+                {"first_name": "Ivan", "last_name": "Ivanov"},
+                {"first_name": "Petro", "last_name": "Petrenko"},
+            ],
+        }
+
+        res = self.client.post(JOURNEY_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Crew.objects.count(), 2)
+        self.assertEqual(
+            sorted(crew["full_name"] for crew in res.data["crew"]),
+            ["Ivan Ivanov", "Petro Petrenko"],
+        )
+        journey = Journey.objects.get(id=res.data["id"])
+        self.assertEqual(journey.crew.count(), 2)
+
+    def test_create_journey_with_new_crew_refreshes_crew_list(self):
+        """Test crew created with a journey shows up in the cached crew list"""
+        cache.clear()
+        self.assertEqual(self.client.get(CREW_URL).data, [])
+        payload = {
+            "route": self.journey.route.id,
+            "train": self.journey.train.id,
+            "departure_time": "2023-10-02 08:00",
+            "arrival_time": "2023-10-02 14:00",
+            "crew": [{"first_name": "New", "last_name": "Guy"}],
+        }
+
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(JOURNEY_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        crew_res = self.client.get(CREW_URL)
+        self.assertEqual([crew["full_name"] for crew in crew_res.data], ["New Guy"])
+
+    def test_update_journey_keeps_seats_booked_meanwhile(self):
+        """Test a journey update does not overwrite concurrently taken seats"""
+        carriage = Carriage.objects.create(number=1, seats=10, train=self.journey.train)
+        update = JourneySerializer.update
+
+        def book_seat_then_update(serializer, instance, validated_data):
+            Ticket.objects.create(
+                seat=1,
+                carriage=carriage,
+                journey=instance,
+                order=Order.objects.create(user=self.user),
+            )
+            return update(serializer, instance, validated_data)
+
+        with mock.patch.object(JourneySerializer, "update", book_seat_then_update):
+            res = self.client.patch(
+                journey_detail_url(self.journey.id),
+                {"arrival_time": "2023-10-01 15:00"},
+                format="json",
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.journey.refresh_from_db()
+        self.assertEqual(self.journey.seats_taken, 1)
+        self.assertEqual(self.journey.total_seats, 10)
+
+    def test_update_journey_loads_only_the_journey_row(self):
+        """Test write actions do not join the route and train tables"""
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.patch(
+                journey_detail_url(self.journey.id),
+                {"arrival_time": "2023-10-01 15:00"},
+                format="json",
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        journey_selects = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("SELECT")
+            and 'FROM "station_journey"' in query["sql"]
+        ]
+        self.assertTrue(journey_selects)
+        for sql in journey_selects:
+            self.assertNotIn("station_route", sql)
+            self.assertNotIn("station_train", sql)
+
+    def test_create_journey_arrival_before_departure(self):
+        """Test a journey cannot arrive before it departs"""
+        payload = {
+            "route": self.journey.route.id,
+            "train": self.journey.train.id,
+            "departure_time": "2023-10-02 14:00",
+            "arrival_time": "2023-10-02 08:00",
+        }
+
+        res = self.client.post(JOURNEY_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("arrival_time", res.data)
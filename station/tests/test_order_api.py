@@ -0,0 +1,126 @@
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import (
+    TrainType,
+    Train,
+    Carriage,
+    Station,
+    Route,
+    Journey,
+    Order,
+    Ticket,
+)
+
+ORDER_URL = reverse("station:order-list")
+
+
+def sample_journey(**params):
+    """Create and return a sample journey with its train and route"""
+    train = Train.objects.create(
+        name="Sample train",
+        number="123",
+        train_type=TrainType.objects.create(name="express"),
+    )
+    route = Route.objects.create(
+        name="Kyiv - Lviv",
+        distance=540,
+        from_station=Station.objects.create(name="Kyiv", latitude=0, longitude=0),
+        to_station=Station.objects.create(name="Lviv", latitude=1, longitude=1),
+    )
+    departure_time = timezone.make_aware(datetime(2023, 10, 1, 8, 0))
+    defaults = {
+        "route": route,
+        "train": train,
+        "departure_time": departure_time,
+        "arrival_time": departure_time + timedelta(hours=6),
+    }
+    defaults.update(params)
+
+    return Journey.objects.create(**defaults)
+
+
+class AuthenticatedOrderApiTest(TestCase):
+    def setUp(self):
+        """Set up test client and create objects needed for tests"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass"
+        )
+        self.client.force_authenticate(self.user)
+
+        self.journey = sample_journey()
+        self.carriage = Carriage.objects.create(
+            number=1, seats=20, train=self.journey.train
+        )
+
+    def order_payload(self, *seats):
+        return {
+            "created_at": "2023-10-01 08:00",
+            "tickets": [
+                {"seat": seat, "carriage": self.carriage.id, "journey": self.journey.id}
+                for seat in seats
+            ],
+        }
+
+    def test_create_order_with_tickets(self):
+        """Test creating an order stores all of its tickets"""
+        res = self.client.post(ORDER_URL, self.order_payload(1, 2, 3), format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        order = Order.objects.get(id=res.data["id"])
+        self.assertEqual(
+            sorted(order.tickets.values_list("seat", flat=True)), [1, 2, 3]
+        )
+        self.journey.refresh_from_db()
+        self.assertEqual(self.journey.seats_taken, 3)
+        self.assertEqual(self.journey.total_seats, 20)
+
+    def test_create_order_with_duplicate_seats(self):
+        """Test the same seat cannot be requested twice in one order"""
+        res = self.client.post(ORDER_URL, self.order_payload(1, 1), format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_create_order_with_taken_seat(self):
+        """Test a seat taken by another order cannot be ordered"""
+        order = Order.objects.create(user=self.user)
+        Ticket.objects.create(
+            seat=2, carriage=self.carriage, journey=self.journey, order=order
+        )
+
+        res = self.client.post(ORDER_URL, self.order_payload(1, 2), format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_create_order_with_seat_out_of_range(self):
+        """Test a seat outside of the carriage range cannot be ordered"""
+        res = self.client.post(ORDER_URL, self.order_payload(1, 21), format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Order.objects.exists())
+
+    def test_list_orders_with_ticket_details(self):
+        """Test order list shows ticket details in a fixed number of queries"""
+        self.client.post(ORDER_URL, self.order_payload(1, 2), format="json")
+        self.client.post(ORDER_URL, self.order_payload(3), format="json")
+
+        with self.assertNumQueries(2):
+            res = self.client.get(ORDER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(res.data["results"]), 2)
+        self.assertIsNone(res.data["next"])
+        ticket = res.data["results"][0]["tickets"][0]
+        self.assertEqual(ticket["seat"], 3)
+        self.assertEqual(ticket["carriage_number"], 1)
+        self.assertEqual(ticket["journey_route_name"], "Kyiv - Lviv")
+        self.assertEqual(ticket["journey_train_number"], 123)
@@ -0,0 +1,36 @@
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+
+from station.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def setUp(self):
+        self.renderer = ORJSONRenderer()
+
+    def test_render_matches_json_renderer(self):
+        """Test ordinary data renders byte for byte like JSONRenderer"""
+        data = {"name": "Kyiv", "latitude": 50.45, "crew": [1, 2], "image": None}
+
+        self.assertEqual(self.renderer.render(data), JSONRenderer().render(data))
+
+    def test_render_escapes_line_separators(self):
+        """Test U+2028 and U+2029 are escaped like JSONRenderer does"""
+        data = {"name": "Kyiv Lviv "}
+
+        rendered = self.renderer.render(data)
+
+        self.assertEqual(rendered, b'{"name":"Kyiv\\u2028Lviv\\u2029"}')
+        self.assertEqual(rendered, JSONRenderer().render(data))
+
+    def test_render_rejects_non_finite_floats(self):
+        """Test NaN and Infinity raise instead of rendering as null"""
+        for value in (float("nan"), float("inf"), float("-inf")):
+            with self.assertRaises(ValueError):
+                self.renderer.render({"latitude": value})
+
+    def test_render_integer_beyond_64_bits(self):
+        """Test integers orjson can't encode still render"""
+        data = {"id": 2**64}
+
+        self.assertEqual(self.renderer.render(data), b'{"id":18446744073709551616}')
@@ -0,0 +1,113 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import Station, Route
+
+STATION_URL = reverse("station:station-list")
+ROUTE_URL = reverse("station:route-list")
+
+
+class StationListCacheTest(TestCase):
+    def setUp(self):
+        """Set up test client and clear cached list responses"""
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass"
+        )
+        self.client.force_authenticate(self.user)
+        Station.objects.create(name="Kyiv", latitude=50.45, longitude=30.52)
+
+    def test_list_stations_is_cached(self):
+        """Test repeated station list requests do not query stations again"""
+        self.client.get(STATION_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(STATION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]["name"], "Kyiv")
+
+    def test_station_change_clears_cache(self):
+        """Test saving a station drops the cached station list"""
+        self.client.get(STATION_URL)
+        with self.captureOnCommitCallbacks(execute=True):
+            Station.objects.create(name="Lviv", latitude=49.84, longitude=24.03)
+
+        res = self.client.get(STATION_URL)
+
+        self.assertEqual(len(res.data), 2)
+
+    def test_uncommitted_station_change_keeps_cache(self):
+        """Test the cached list survives until a station change is committed"""
+        self.client.get(STATION_URL)
+        with self.captureOnCommitCallbacks() as callbacks:
+            Station.objects.create(name="Lviv", latitude=49.84, longitude=24.03)
+
+        self.assertEqual(len(callbacks), 1)
+        with self.assertNumQueries(0):
+            self.client.get(STATION_URL)
+
+    def test_list_stations_not_modified(self):
+        """Test station list answers a matching If-None-Match with 304"""
+        etag = self.client.get(STATION_URL)["ETag"]
+
+        with self.assertNumQueries(0):
+            res = self.client.get(STATION_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res["ETag"], etag)
+
+    def test_station_change_changes_etag(self):
+        """Test renaming a station gives the station list a new ETag"""
+        etag = self.client.get(STATION_URL)["ETag"]
+        station = Station.objects.get(name="Kyiv")
+        station.name = "Kyiv-Pasazhyrskyi"
+        with self.captureOnCommitCallbacks(execute=True):
+            station.save()
+
+        res = self.client.get(STATION_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res["ETag"], etag)
+
+    def test_auth_required_for_cached_list(self):
+        """Test cached station list is not served to anonymous users"""
+        self.client.get(STATION_URL)
+
+        res = APIClient().get(STATION_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class RouteApiTest(TestCase):
+    def setUp(self):
+        """Set up test client and a route between two stations"""
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="testpass"
+        )
+        self.client.force_authenticate(self.user)
+        Route.objects.create(
+            name="Kyiv - Lviv",
+            distance=540,
+            from_station=Station.objects.create(
+                name="Kyiv", latitude=50.45, longitude=30.52
+            ),
+            to_station=Station.objects.create(
+                name="Lviv", latitude=49.84, longitude=24.03
+            ),
+        )
+
+    def test_list_routes(self):
+        """Test route list shows station names in a single query"""
+        with self.assertNumQueries(1):
+            res = self.client.get(ROUTE_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data[0]["from_station"], "Kyiv")
+        self.assertEqual(res.data[0]["to_station"], "Lviv")
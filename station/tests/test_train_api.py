@@ -5,7 +5,8 @@ from django.test import override_settings
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.urls import reverse
-from django.db.models import Count
+from django.db.models import Count, Sum, Value
+from django.db.models.functions import Coalesce
 
 from rest_framework.test import APIClient
 from rest_framework import status
@@ -97,48 +98,56 @@ class AdminTrainApiTest(TestCase):
 
 
 class AuthenticatedTrainApiTest(TestCase):
-    def setUp(self) -> None:
-        """Set up test client and create objects needed for tests"""
-
-        self.client = APIClient()
-        self.user = get_user_model().objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        """Create objects needed for tests once for the whole class"""
+        cls.user = get_user_model().objects.create_user(
             email="test@test.com", password="testpass", is_staff=False
         )
-        self.client.force_authenticate(self.user)
 
-        # Objects needed for tests
-        self.train_type1 = sample_train_type(name="express")
-        self.train_type2 = sample_train_type(name="ordinary")
-        self.train_type3 = sample_train_type(name="hight-speed")
-
-        self.train1 = sample_train(
-            name="sample train 1", number="111", train_type=self.train_type1
-        )
-        self.train2 = sample_train(
-            name="sample train 2", number="222", train_type=self.train_type2
+        cls.train_type1, cls.train_type2, cls.train_type3 = (
+            TrainType.objects.bulk_create(
+                [
+                    TrainType(name="express"),
+                    TrainType(name="ordinary"),
+                    TrainType(name="hight-speed"),
+                ]
+            )
         )
-        self.train3 = sample_train(
-            name="sample3 train 3", number="333", train_type=self.train_type3
+
+        cls.train1, cls.train2, cls.train3 = Train.objects.bulk_create(
+            [
+                Train(name="sample train 1", number="111", train_type=cls.train_type1),
+                Train(name="sample train 2", number="222", train_type=cls.train_type2),
+                Train(name="sample3 train 3", number="333", train_type=cls.train_type3),
+            ]
         )
 
-        sample_carriage(number="1", train=self.train1)
-        sample_carriage(number="2", train=self.train2)
-        sample_carriage(number="3", train=self.train2)
+        Carriage.objects.bulk_create(
+            [
+                Carriage(number=1, seats=20, train=cls.train1),
+                Carriage(number=2, seats=20, train=cls.train2),
+                Carriage(number=3, seats=20, train=cls.train2),
+            ]
+        )
 
-        self.payload = {
+        cls.payload = {
             "name": "Sample train",
             "number": "123",
             "train_type": sample_train_type().id,
         }
 
-        self.trains = (
-            Train.objects.all()
-            .order_by("-id")
-            .annotate(carriage_count=Count("carriages"))
-        )
-        self.serializer1 = TrainListSerializer(self.trains.get(id=self.train1.id))
-        self.serializer2 = TrainListSerializer(self.trains.get(id=self.train2.id))
-        self.serializer3 = TrainListSerializer(self.trains.get(id=self.train3.id))
+        trains = Train.objects.annotate(
+            carriage_count=Count("carriages"),
+            capacity=Coalesce(Sum("carriages__seats"), Value(0)),
+        ).filter(id__in=[cls.train1.id, cls.train2.id, cls.train3.id])
+        cls.trains_data = TrainListSerializer(trains, many=True).data
+        cls.train1_data, cls.train2_data, cls.train3_data = cls.trains_data
+
+    def setUp(self) -> None:
+        """Set up test client"""
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
 
     def test_create_train_forbidden(self):
         """Test creating a new train"""
@@ -150,13 +159,16 @@ class AuthenticatedTrainApiTest(TestCase):
         """Test retrieving a list of trains"""
         res = self.client.get(TRAIN_URL)
 
-        serializer = TrainListSerializer(self.trains, many=True)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["results"], self.trains_data)
+
+    def test_list_trains_not_modified(self):
+        """Test an unchanged train list is answered with 304 Not Modified"""
+        etag = self.client.get(TRAIN_URL)["ETag"]
 
-        res_data_sorted = sorted(res.data, key=lambda x: x["id"])
-        serializer_data_sorted = sorted(serializer.data, key=lambda x: x["id"])
+        res = self.client.get(TRAIN_URL, HTTP_IF_NONE_MATCH=etag)
 
-        self.assertEqual(res.status_code, status.HTTP_200_OK)
-        self.assertEqual(res_data_sorted, serializer_data_sorted)
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
 
     def test_retrieve_train_detail(self):
         """Test retrieving a train"""
@@ -166,29 +178,39 @@ class AuthenticatedTrainApiTest(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data["id"], self.train1.id)
 
+    def test_retrieve_train_detail_carriages(self):
+        """Test train detail lists its carriages with the train name"""
+        url = train_detail_url(self.train2.id)
+        res = self.client.get(url)
+
+        self.assertEqual(
+            [carriage["number"] for carriage in res.data["carriages"]], [2, 3]
+        )
+        self.assertEqual(res.data["carriages"][0]["train"], self.train2.name)
+
     def test_filter_train_by_number(self):
         """Test filtering trains by number"""
         res = self.client.get(TRAIN_URL, {"number": "222"})
 
-        self.assertIn(self.serializer2.data, res.data)
-        self.assertNotIn(self.serializer1.data, res.data)
-        self.assertNotIn(self.serializer3.data, res.data)
+        self.assertIn(self.train2_data, res.data["results"])
+        self.assertNotIn(self.train1_data, res.data["results"])
+        self.assertNotIn(self.train3_data, res.data["results"])
 
     def test_filter_train_by_train_type(self):
         """Test filtering trains by train type name"""
         res = self.client.get(TRAIN_URL, {"train_type_name": self.train_type2.name})
 
-        self.assertIn(self.serializer2.data, res.data)
-        self.assertNotIn(self.serializer1.data, res.data)
-        self.assertNotIn(self.serializer3.data, res.data)
+        self.assertIn(self.train2_data, res.data["results"])
+        self.assertNotIn(self.train1_data, res.data["results"])
+        self.assertNotIn(self.train3_data, res.data["results"])
 
     def test_filter_train_by_name(self):
         """Test filtering trains by name"""
         res = self.client.get(TRAIN_URL, {"name": "sample train 1"})
 
-        self.assertIn(self.serializer1.data, res.data)
-        self.assertNotIn(self.serializer2.data, res.data)
-        self.assertNotIn(self.serializer3.data, res.data)
+        self.assertIn(self.train1_data, res.data["results"])
+        self.assertNotIn(self.train2_data, res.data["results"])
+        self.assertNotIn(self.train3_data, res.data["results"])
 
 
 class UnauthenticatedTrainApiTest(TestCase):
@@ -200,6 +222,13 @@ class UnauthenticatedTrainApiTest(TestCase):
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
 
+IN_MEMORY_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+
+
+@override_settings(STORAGES=IN_MEMORY_STORAGES)
 class TrainImageUploadTests(TestCase):
     def setUp(self):
         """Set up admin user and create objects needed for tests"""
@@ -220,7 +249,6 @@ class TrainImageUploadTests(TestCase):
         """Clean up files after tests"""
         self.train.image.delete()
 
-    @override_settings(MEDIA_ROOT=tempfile.gettempdir())
     def test_upload_image_to_train(self):
         """Test uploading an image to train"""
         url = image_upload_url(self.train.id)
@@ -235,7 +263,6 @@ class TrainImageUploadTests(TestCase):
         self.assertIn("image", res.data)
         self.assertTrue(self.train.image)
 
-    @override_settings(MEDIA_ROOT=tempfile.gettempdir())
     def test_upload_image_bad_request(self):
         """Test uploading an invalid image"""
         url = image_upload_url(self.train.id)
@@ -243,7 +270,24 @@ class TrainImageUploadTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
-    @override_settings(MEDIA_ROOT=tempfile.gettempdir())
+    def test_upload_without_image_keeps_existing_image(self):
+        """Test posting no file does not clear an uploaded image"""
+        url = image_upload_url(self.train.id)
+        with tempfile.NamedTemporaryFile(suffix=".jpg") as ntf:
+            img = Image.new("RGB", (10, 10))
+            img.save(ntf, format="JPEG")
+            ntf.seek(0)
+            self.client.post(url, {"image": ntf}, format="multipart")
+        self.train.refresh_from_db()
+        image_name = self.train.image.name
+
+        res = self.client.post(url, {}, format="multipart")
+
+        self.train.refresh_from_db()
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(res.data["image"])
+        self.assertEqual(self.train.image.name, image_name)
+
     def test_post_image_to_train_list_should_not_work(self):
         """Test that posting image to train list should not work"""
         url = TRAIN_URL
@@ -265,7 +309,6 @@ class TrainImageUploadTests(TestCase):
         train = Train.objects.get(name="Train")
         self.assertFalse(train.image)
 
-    @override_settings(MEDIA_ROOT=tempfile.gettempdir())
     def test_image_url_is_shown_on_train_detail(self):
         """Test that image url is shown on train detail"""
         url = image_upload_url(self.train.id)
@@ -280,7 +323,6 @@ class TrainImageUploadTests(TestCase):
 
         self.assertIn("image", res.data)
 
-    @override_settings(MEDIA_ROOT=tempfile.gettempdir())
     def test_image_url_is_shown_on_train_list(self):
         """Test that image url is shown on train list"""
         url = image_upload_url(self.train.id)
@@ -293,4 +335,6 @@ class TrainImageUploadTests(TestCase):
         url = TRAIN_URL
         res = self.client.get(url)
 
-        self.assertIn("image", res.data[0])
+        self.assertIn("image", res.data["results"][0])
+        detail_res = self.client.get(train_detail_url(self.train.id))
+        self.assertEqual(res.data["results"][0]["image"], detail_res.data["image"])
@@ -13,16 +13,17 @@ class UploadToPath(object):
 
     def __init__(self, upload_to):
         self.upload_to = upload_to
+        self.directory_name = os.path.normpath(force_str(upload_to))
 
     def __call__(self, instance, filename):
         return self.generate_filename(filename)
 
     def get_directory_name(self):
-        return os.path.normpath(force_str(self.upload_to))
+        return self.directory_name
 
     def get_filename(self, filename):
         _, extension = os.path.splitext(filename)
         return f"{uuid.uuid4()}{extension}"
 
     def generate_filename(self, filename):
-        return os.path.join(self.get_directory_name(), self.get_filename(filename))
+        return os.path.join(self.directory_name, self.get_filename(filename))
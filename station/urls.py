@@ -1,4 +1,3 @@
-from django.urls import path, include
 from rest_framework import routers
 
 from station.views import (
@@ -12,7 +11,7 @@ from station.views import (
     OrderViewSet,
 )
 
-router = routers.DefaultRouter()
+router = routers.SimpleRouter()
 router.register("train_types", TrainTypeViewSet)
 router.register("trains", TrainViewSet)
 router.register("carriages", CarriageViewSet)
@@ -1,16 +1,28 @@
-from datetime import datetime
-
-from django.db.models import OuterRef, Subquery, Sum, Count, Value
+from datetime import date, datetime, time, timedelta
+from functools import wraps
+
+from django.db.models import (
+    Sum,
+    Count,
+    Value,
+    Prefetch,
+    F,
+    OuterRef,
+    Subquery,
+)
 from django.db.models.functions import Coalesce
+from django.utils import timezone
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import mixins, viewsets, status
 from rest_framework.decorators import action
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
+from station.cache import CachedListMixin
 from station.models import (
     TrainType,
     Train,
@@ -44,8 +56,68 @@ from station.serializers import (
     CrewImageSerializer,
 )
 
+_train_carriages = (
+    Carriage.objects.filter(train=OuterRef("pk")).order_by().values("train")
+)
+# train list annotations, built once at import
+TRAIN_CARRIAGE_COUNT = Coalesce(
+    Subquery(_train_carriages.annotate(count=Count("*")).values("count")),
+    Value(0),
+)
+TRAIN_CAPACITY = Coalesce(
+    Subquery(_train_carriages.annotate(total=Sum("seats")).values("total")),
+    Value(0),
+)
+
+
+def queryset_per_request(get_queryset):
+    """
+    Build the viewset queryset once per request.
+    A fresh clone is returned so cached results are never reused.
+    """
+
+    @wraps(get_queryset)
+    def wrapper(self):
+        if not hasattr(self, "_request_queryset"):
+            self._request_queryset = get_queryset(self)
+        return self._request_queryset.all()
+
+    return wrapper
+
+
+class ValuesListMixin:
+    """
+    List plain values rows of the serializer fields, skipping model instances.
+    Only for serializers made of flat model columns.
+    """
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *self.get_serializer_class().Meta.fields
+        )
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(page)
+
+        return Response(list(queryset))
+
+
+class ListPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class OrderPagination(CursorPagination):
+    page_size = 5
+    max_page_size = 100
+    ordering = "-created_at"
+
 
 class TrainTypeViewSet(
+    CachedListMixin,
+    ValuesListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
@@ -61,12 +133,9 @@ class TrainViewSet(
     mixins.RetrieveModelMixin,
     GenericViewSet,
 ):
-    queryset = (
-        Train.objects.select_related("train_type")
-        .prefetch_related("carriages")
-        .annotate(carriage_count=Count("carriages"))
-    )
+    queryset = Train.objects.order_by("number", "id")
     serializer_class = TrainSerializer
+    pagination_class = ListPagination
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
     def get_serializer_class(self):
@@ -78,6 +147,7 @@ class TrainViewSet(
             return TrainImageSerializer
         return TrainSerializer
 
+    @queryset_per_request
     def get_queryset(self):
         """Retrieve the trains with filters"""
         name = self.request.query_params.get("name")
@@ -85,6 +155,21 @@ class TrainViewSet(
         train_type_name = self.request.query_params.get("train_type_name")
         queryset = super().get_queryset()
 
+        if self.action == "list":
+            queryset = queryset.annotate(
+                carriage_count=TRAIN_CARRIAGE_COUNT, capacity=TRAIN_CAPACITY
+            )
+
+        if self.action == "retrieve":
+            queryset = queryset.select_related("train_type").prefetch_related(
+                Prefetch(
+                    "carriages",
+                    queryset=Carriage.objects.only(
+                        "id", "number", "carriage_type", "seats", "train_id"
+                    ),
+                )
+            )
+
         if number is not None:
             queryset = queryset.filter(number__icontains=number)
 
@@ -130,7 +215,18 @@ class TrainViewSet(
         ]
     )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        """List trains from plain values rows, skipping model instances"""
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *TrainListSerializer.values_fields
+        )
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                TrainListSerializer.represent_values(page, request)
+            )
+
+        return Response(TrainListSerializer.represent_values(queryset, request))
 
 
 class CarriageViewSet(
@@ -139,10 +235,27 @@ class CarriageViewSet(
     mixins.RetrieveModelMixin,
     GenericViewSet,
 ):
-    queryset = Carriage.objects.select_related("train")
+    queryset = Carriage.objects.select_related("train").order_by("number", "id")
     serializer_class = CarriageSerializer
+    pagination_class = ListPagination
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
+    def get_serializer(self, *args, **kwargs):
+        """Accept a list of carriages to create them in bulk"""
+        if isinstance(kwargs.get("data"), list):
+            kwargs["many"] = True
+        return super().get_serializer(*args, **kwargs)
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        if self.action in ["list", "retrieve"]:
+            queryset = queryset.only(
+                "id", "number", "carriage_type", "seats", "train__name"
+            )
+
+        return queryset
+
     def get_serializer_class(self):
         if self.action in ["list", "retrieve"]:
             return CarriageListSerializer
@@ -150,6 +263,8 @@ class CarriageViewSet(
 
 
 class StationViewSet(
+    CachedListMixin,
+    ValuesListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
@@ -168,6 +283,16 @@ class RouteViewSet(
     serializer_class = RouteSerializer
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+
+        if self.action == "list":
+            queryset = queryset.only(
+                "id", "name", "distance", "from_station__name", "to_station__name"
+            )
+
+        return queryset
+
     def get_serializer_class(self):
         if self.action in ["list", "retrieve"]:
             return RouteListSerializer
@@ -175,6 +300,7 @@ class RouteViewSet(
 
 
 class CrewViewSet(
+    CachedListMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     GenericViewSet,
@@ -204,53 +330,82 @@ class CrewViewSet(
 
 
 class JourneyViewSet(viewsets.ModelViewSet):
-    queryset = Journey.objects.select_related(
-        "route__to_station", "route__from_station", "train__train_type"
-    ).prefetch_related("crew")
+    queryset = Journey.objects.order_by("-departure_time", "id")
     serializer_class = JourneySerializer
+    pagination_class = ListPagination
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
+    @queryset_per_request
     def get_queryset(self):
         """
-        Subquery for tickets count for each journey.
+        Available tickets from the journey seat counters.
         Retrieve the journeys with filters.
         """
 
-        tickets_subquery = (
-            Ticket.objects.filter(journey=OuterRef("pk"))
-            .values("journey")
-            .annotate(cnt=Count("id"))
-            .values("cnt")
-        )
+        queryset = super().get_queryset()
 
-        queryset = (
-            super()
-            .get_queryset()
-            .annotate(
-                tickets_available=(
-                    Sum("train__carriages__seats")
-                    - Coalesce(Subquery(tickets_subquery), Value(0))
-                )
+        if self.action != "retrieve":
+            queryset = queryset.select_related(None)
+
+        if self.action == "list":
+            queryset = queryset.annotate(
+                tickets_available=F("total_seats") - F("seats_taken")
+            )
+
+        if self.action == "retrieve":
+            queryset = queryset.select_related(
+                "route__to_station", "route__from_station", "train__train_type"
+            ).prefetch_related(
+                "crew",
+                Prefetch(
+                    "tickets",
+                    queryset=Ticket.raw_objects.only(
+                        "seat", "carriage_id", "journey_id"
+                    ),
+                ),
+                Prefetch(
+                    "train__carriages",
+                    queryset=Carriage.objects.only(
+                        "id", "number", "carriage_type", "seats", "train_id"
+                    ),
+                ),
             )
-        )
 
         departure_time = self.request.query_params.get("departure_time")
         arrival_time = self.request.query_params.get("arrival_time")
         train_id_str = self.request.query_params.get("train")
 
         if departure_time is not None:
-            departure_date = datetime.strptime(departure_time, "%Y-%m-%d").date()
-            queryset = queryset.filter(departure_time__day=departure_date.day)
+            day_start, day_end = self._day_range("departure_time", departure_time)
+            queryset = queryset.filter(
+                departure_time__gte=day_start, departure_time__lt=day_end
+            )
 
         if arrival_time is not None:
-            arrival_date = datetime.strptime(arrival_time, "%Y-%m-%d").date()
-            queryset = queryset.filter(arrival_time__day=arrival_date.day)
+            day_start, day_end = self._day_range("arrival_time", arrival_time)
+            queryset = queryset.filter(
+                arrival_time__gte=day_start, arrival_time__lt=day_end
+            )
 
         if train_id_str is not None:
-            queryset = queryset.filter(train__id=int(train_id_str))
+            try:
+                train_id = int(train_id_str)
+            except ValueError:
+                raise ValidationError({"train": "Train id must be an integer."})
+            queryset = queryset.filter(train_id=train_id)
 
         return queryset
 
+    @staticmethod
+    def _day_range(param, date_str):
+        """Converts a date string to the [start, end) bounds of that day"""
+        try:
+            day = date.fromisoformat(date_str)
+        except ValueError:
+            raise ValidationError({param: "Date must be in YYYY-MM-DD format."})
+        day_start = timezone.make_aware(datetime.combine(day, time.min))
+        return day_start, day_start + timedelta(days=1)
+
     def get_serializer_class(self):
         if self.action == "list":
             return JourneyListSerializer
@@ -296,12 +451,18 @@ class JourneyViewSet(viewsets.ModelViewSet):
         ]
     )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        """List journeys from plain values rows, skipping model instances"""
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *JourneyListSerializer.values_fields
+        )
 
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                JourneyListSerializer.represent_values(page, request)
+            )
 
-class OrderPagination(PageNumberPagination):
-    page_size = 5
-    max_page_size = 100
+        return Response(JourneyListSerializer.represent_values(queryset, request))
 
 
 class OrderViewSet(
@@ -309,13 +470,28 @@ class OrderViewSet(
     mixins.ListModelMixin,
     GenericViewSet,
 ):
-    queryset = Order.objects.select_related("ticket__carriage__train")
+    queryset = Order.objects.all()
     serializer_class = OrderSerializer
     pagination_class = OrderPagination
     permission_classes = (IsAuthenticated,)
 
     def get_queryset(self):
-        return Order.objects.filter(user=self.request.user)
+        queryset = super().get_queryset().filter(user=self.request.user)
+
+        if self.action == "list":
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "tickets",
+                    queryset=Ticket.raw_objects.only("id", "seat", "order_id").annotate(
+                        carriage_number=F("carriage__number"),
+                        journey_route_name=F("journey__route__name"),
+                        journey_train_number=F("journey__train__number"),
+                        journey_departure_time=F("journey__departure_time"),
+                    ),
+                )
+            )
+
+        return queryset
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
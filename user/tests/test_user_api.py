@@ -1,72 +1,80 @@
 from django.contrib.auth import get_user_model
-from django.urls import reverse
+from django.urls import resolve, reverse
 from rest_framework import status
-from rest_framework.test import APIClient, APITestCase
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
 
+from user.views import CreateUserView
 
-class UserTests(APITestCase):
-    def setUp(self):
-        self.client = APIClient()
-        self.user = get_user_model().objects.create_user(
-            email="testuser@test.com", password="testing1234"
-        )
+CREATE_USER_URL = reverse("user:create")
+TOKEN_OBTAIN_URL = reverse("user:token_obtain_pair")
+TOKEN_REFRESH_URL = reverse("user:token_refresh")
+TOKEN_VERIFY_URL = reverse("user:token_verify")
+MANAGE_USER_URL = reverse("user:manage")
+
+
+class UserRegistrationTests(APITestCase):
+    def test_registration_url(self):
+        self.assertIs(resolve(CREATE_USER_URL).func.view_class, CreateUserView)
 
     def test_registration(self):
-        url = reverse("user:create")
         data = {
             "email": "testemail@test.com",
             "password": "testpassword",
         }
-        response = self.client.post(url, data, format="json")
+        request = APIRequestFactory().post(CREATE_USER_URL, data, format="json")
+        # call the view directly, skipping the middleware stack
+        response = CreateUserView.as_view()(request)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertIsNotNone(response.data.get("id"))
 
+
+class UserTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="testuser@test.com", password="testing1234"
+        )
+
+    def auth_header(self):
+        """Return a bearer header without going through the login endpoint"""
+        access_token = RefreshToken.for_user(self.user).access_token
+        return {"HTTP_AUTHORIZATION": f"Bearer {access_token}"}
+
     def test_token_obtaining(self):
-        url = reverse("user:token_obtain_pair")
         data = {
             "email": "testuser@test.com",
             "password": "testing1234",
         }
-        response = self.client.post(url, data, format="json")
+        response = self.client.post(TOKEN_OBTAIN_URL, data, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIsNotNone(response.data.get("access"))
         self.assertIsNotNone(response.data.get("refresh"))
 
     def test_token_refresh(self):
-        url = reverse("user:token_refresh")
-        # Initiate token obtaining first
-        obtain_token_url = reverse("user:token_obtain_pair")
-        login_data = {
-            "email": "testuser@test.com",
-            "password": "testing1234",
-        }
-        response_obtain_token = self.client.post(
-            obtain_token_url, login_data, format="json"
-        )
-        refresh_token = response_obtain_token.data.get("refresh")
+        refresh_token = str(RefreshToken.for_user(self.user))
 
-        response = self.client.post(url, {"refresh": refresh_token}, format="json")
+        response = self.client.post(
+            TOKEN_REFRESH_URL, {"refresh": refresh_token}, format="json"
+        )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIsNotNone(response.data.get("access"))
 
     def test_token_verification(self):
-        url = reverse("user:token_verify")
+        access_token = str(RefreshToken.for_user(self.user).access_token)
 
-        obtain_token_url = reverse("user:token_obtain_pair")
-        login_data = {
-            "email": "testuser@test.com",
-            "password": "testing1234",
-        }
-        response_obtain_token = self.client.post(
-            obtain_token_url, login_data, format="json"
+        response = self.client.post(
+            TOKEN_VERIFY_URL, {"token": access_token}, format="json"
         )
-        access_token = response_obtain_token.data.get("access")
-        response = self.client.post(url, {"token": access_token}, format="json")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
     def test_manage_user_data(self):
-        url = reverse("user:manage")
         self.client.force_authenticate(user=self.user)
-        response = self.client.get(url)
+        response = self.client.get(MANAGE_USER_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.user.email, response.data.get("email"))
+
+    def test_manage_user_data_with_access_token(self):
+        response = self.client.get(MANAGE_USER_URL, **self.auth_header())
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(self.user.email, response.data.get("email"))